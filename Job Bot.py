@@ -1,4 +1,6 @@
 import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import select_proxy
 from bs4 import BeautifulSoup
 import json
 import csv
@@ -8,6 +10,7 @@ from typing import List, Dict, Optional
 import logging
 import re
 import os
+import threading
 
 # --- Setup Logging ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -39,8 +42,63 @@ class ProxyRotator:
         logger.warning(f"Marking proxy as failed: {proxy}")
         self.failed_proxies.add(proxy)
 
+class CountingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that counts, per proxy, new connections opened and requests sent.
+
+    Requests that did not open a connection went out over a reused keep-alive one.
+    """
+    def __init__(self, *args, **kwargs):
+        self._stats_lock = threading.Lock()
+        self.requests_sent = {}
+        self.connections_opened = {}
+        super().__init__(*args, **kwargs)
+
+    def _count(self, counter: Dict[str, int], key: str):
+        with self._stats_lock:
+            counter[key] = counter.get(key, 0) + 1
+
+    def _wrap_pools(self, manager, key: str):
+        # Subclass the manager's own pool classes so SOCKS and plain proxies keep working
+        adapter = self
+        def counting(pool_class):
+            class CountingPool(pool_class):
+                def _new_conn(self):
+                    adapter._count(adapter.connections_opened, key)
+                    return super()._new_conn()
+            return CountingPool
+        manager.pool_classes_by_scheme = {scheme: counting(cls) for scheme, cls in manager.pool_classes_by_scheme.items()}
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self._wrap_pools(self.poolmanager, 'direct')
+
+    def proxy_manager_for(self, proxy: str, **proxy_kwargs):
+        is_new = proxy not in self.proxy_manager
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        if is_new:
+            self._wrap_pools(manager, proxy)
+        return manager
+
+    def send(self, request, **kwargs):
+        self._count(self.requests_sent, select_proxy(request.url, kwargs.get('proxies')) or 'direct')
+        return super().send(request, **kwargs)
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            per_proxy = {}
+            for key, sent in self.requests_sent.items():
+                opened = self.connections_opened.get(key, 0)
+                per_proxy[key] = {'requests': sent, 'opened': opened, 'reused': max(0, sent - opened)}
+        return {
+            'requests': sum(p['requests'] for p in per_proxy.values()),
+            'opened': sum(p['opened'] for p in per_proxy.values()),
+            'reused': sum(p['reused'] for p in per_proxy.values()),
+            'per_proxy': per_proxy,
+        }
+
 class LinkedInJobScraper:
-    def __init__(self, proxies: List[str] = None, use_proxies: bool = False):
+    def __init__(self, proxies: List[str] = None, use_proxies: bool = False,
+                 pool_connections: int = 10, pool_maxsize: int = 10):
         self.base_search_url = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
         self.base_job_url = "https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/"
         self.headers = {
@@ -53,6 +111,11 @@ class LinkedInJobScraper:
         self.max_retries = 3
         self.retry_delay = 5
         self.backoff_factor = 2
+        # One keep-alive pool per host and proxy; pool_connections caps how many are kept
+        self.adapter = CountingHTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session = requests.Session()
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
 
     def _rotate_user_agent(self):
         agents = [
@@ -73,7 +136,7 @@ class LinkedInJobScraper:
                     delay = self.retry_delay * (self.backoff_factor ** (attempt - 1)) + random.uniform(0, 1)
                     logger.info(f"Retrying request to {url} in {delay:.2f} seconds...")
                     time.sleep(delay)
-                response = requests.get(url, params=params, headers=self.headers, proxies=proxies, timeout=20)
+                response = self.session.get(url, params=params, headers=self.headers, proxies=proxies, timeout=20)
                 if response.status_code == 429:
                     logger.warning("Rate limit hit (429). Waiting for 60 seconds.")
                     time.sleep(60)
@@ -243,6 +306,13 @@ class LinkedInJobScraper:
         # <-- NEW: Return only the number of jobs requested by the limit
         return detailed_jobs[:limit]
 
+    def connection_stats(self) -> Dict:
+        """Connections opened versus reused, overall and per proxy"""
+        return self.adapter.stats()
+
+    def close(self):
+        self.session.close()
+
     def save_to_json(self, jobs: List[Dict], filename: str = 'linkedin_jobs.json'):
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(jobs, f, indent=2, ensure_ascii=False)
@@ -294,6 +364,10 @@ if __name__ == "__main__":
         limit=scrape_limit
     )
     
+    stats = scraper.connection_stats()
+    logger.info(f"Connections: {stats['opened']} opened, {stats['reused']} reused over {stats['requests']} requests")
+    scraper.close()
+
     if jobs:
         scraper.save_to_json(jobs, json_output_path)
         scraper.save_to_csv(jobs, csv_output_path)
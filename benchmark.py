@@ -0,0 +1,348 @@
+"""Throughput benchmark for the Anika.py scraper against a local stand-in for LinkedIn.
+
+The stand-in serves search pages in LinkedIn's guest markup and job pages that take
+--latency seconds to answer, so the numbers reflect time spent waiting on sockets
+rather than LinkedIn's rate limits. Rate limiting is switched off for the run.
+
+    python benchmark.py --jobs 100 --latency 0.2 --concurrency 16
+    python benchmark.py --scenario hedging --proxies 3 --tail-fraction 0.02 --tail-latency 2
+    python benchmark.py --scenario http2 --jobs 200 --concurrency 32
+    python benchmark.py --scenario streaming --jobs 100 --similar-jobs 400
+
+The hedging scenario also runs stand-ins as HTTP proxies (they answer absolute-URI
+requests), a --tail-fraction of whose job pages take --tail-latency seconds longer.
+The http2 scenario serves the same pages over HTTP/1.1 and cleartext HTTP/2 (h2c) with
+hypercorn, and compares the requests session against HTTPXTransport on it.
+"""
+import argparse
+import asyncio
+import functools
+import gzip
+import logging
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import urlparse, parse_qs
+
+import Anika
+
+PAGE_SIZE = 25
+SEARCH_PATH = '/jobs-guest/jobs/api/seeMoreJobPostings/search'
+
+CARD_TEMPLATE = '''<li><div class="base-card">
+  <a class="base-card__full-link" href="{base}/jobs/view/standin-analyst-{job_id}?trk=bench"></a>
+  <h3 class="base-search-card__title">Analyst {job_id}</h3>
+  <h4 class="base-search-card__subtitle"><a href="{base}/company/{job_id}">Company {job_id}</a></h4>
+  <span class="job-search-card__location">Pune, Maharashtra, India</span>
+  <time class="job-search-card__listdate" datetime="2024-01-01">{job_id} hours ago</time>
+  <span class="job-search-card__applicant-count">{job_id} applicants</span>
+</div></li>'''
+
+# Laid out like LinkedIn's guest job page: top card, pay, description and criteria, then
+# a long tail of similar jobs that the scraper never reads
+DETAIL_TEMPLATE = '''<html><body>
+<div class="top-card-layout__entity-info"><h1>Analyst {job_id}</h1></div>
+<button class="jobs-apply-button jobs-apply-button--easy-apply">Easy Apply</button>
+<div class="salary-main-rail-card__salary-info-container">INR 10,00,000/yr</div>
+<div class="show-more-less-html__markup">{description}</div>
+<ul class="description__job-criteria-list">
+  <li><h3 class="description__job-criteria-subheader">Seniority level</h3><span class="description__job-criteria-text">Associate</span></li>
+  <li><h3 class="description__job-criteria-subheader">Employment type</h3><span class="description__job-criteria-text">Full-time</span></li>
+</ul>
+<section class="similar-jobs">{similar_jobs}</section>
+</body></html>'''
+
+SIMILAR_JOB = '<li><a href="/jobs/view/similar-{n}?refId={ref}">Similar role {n}</a><span>{n} hours ago</span></li>'
+
+
+
+def render_page(base: str, path: str, query: str, total_jobs: int, similar_jobs: int = 100) -> Optional[str]:
+    """Body of a stand-in search or job page, or None for any other path"""
+    if path == SEARCH_PATH:
+        start = int(parse_qs(query).get('start', ['0'])[0])
+        ids = range(start, min(start + PAGE_SIZE, total_jobs))
+        cards = ''.join(CARD_TEMPLATE.format(base=base, job_id=job_id) for job_id in ids)
+        return f'<ul class="jobs-search__results-list">{cards}</ul>'
+    if path.startswith('/jobs/view/'):
+        job_id = path.rsplit('-', 1)[-1]
+        # Tracking ids keep the tail from compressing away, as on the real page
+        tail = ''.join(SIMILAR_JOB.format(n=n, ref=random.getrandbits(128)) for n in range(similar_jobs))
+        return DETAIL_TEMPLATE.format(job_id=job_id, description='Budgeting and forecasting. ' * 200,
+                                      similar_jobs=tail)
+    return None
+
+
+def job_etag(path: str) -> Optional[str]:
+    """Stable validator for a stand-in job page; the posting never changes, only its tracking tail"""
+    if path.startswith('/jobs/view/'):
+        return f'"job-{path.rsplit("-", 1)[-1]}"'
+    return None
+
+
+def job_page_delay(server) -> float:
+    delay = server.latency
+    if random.random() < server.tail_fraction:
+        delay += server.tail_latency
+    return delay
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        base = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+        body = render_page(base, url.path, url.query, self.server.total_jobs, self.server.similar_jobs)
+        if body is None:
+            self.send_error(404)
+            return
+        if url.path.startswith('/jobs/view/'):
+            time.sleep(job_page_delay(self.server))
+        etag = job_etag(url.path)
+        if etag and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        payload = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        if etag:
+            self.send_header('ETag', etag)
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            payload = gzip.compress(payload)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def handle_error(self, request, client_address):
+        # Clients hang up on abandoned hedge copies; that is expected, not an error
+        pass
+
+    def __init__(self, total_jobs: int, latency: float, tail_fraction: float = 0.0, tail_latency: float = 0.0,
+                 similar_jobs: int = 100):
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        self.total_jobs = total_jobs
+        self.similar_jobs = similar_jobs
+        self.latency = latency
+        self.tail_fraction = tail_fraction
+        self.tail_latency = tail_latency
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address
+        return f"http://{host}:{port}"
+
+
+def start_stand_in_server(total_jobs: int, latency: float, tail_fraction: float = 0.0,
+                          tail_latency: float = 0.0, similar_jobs: int = 100) -> StandInServer:
+    server = StandInServer(total_jobs, latency, tail_fraction, tail_latency, similar_jobs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class H2StandInServer:
+    """The stand-in as an ASGI app under hypercorn, speaking HTTP/1.1 and h2c on one port.
+
+    Counts the distinct client connections it has served, so runs can show how many
+    sockets each transport needed.
+    """
+    def __init__(self, total_jobs: int, latency: float, tail_fraction: float = 0.0, tail_latency: float = 0.0,
+                 similar_jobs: int = 100):
+        from hypercorn.config import Config
+        from hypercorn.asyncio import serve
+        self.total_jobs = total_jobs
+        self.similar_jobs = similar_jobs
+        self.latency = latency
+        self.tail_fraction = tail_fraction
+        self.tail_latency = tail_latency
+        self.connections = set()
+        probe = socket.socket()
+        probe.bind(('127.0.0.1', 0))
+        self.port = probe.getsockname()[1]
+        probe.close()
+        config = Config()
+        config.bind = [f'127.0.0.1:{self.port}']
+        config.loglevel = 'WARNING'
+        config.h2_max_concurrent_streams = 1000
+        self._loop = asyncio.new_event_loop()
+        self._stopped = asyncio.Event()
+        self._thread = threading.Thread(
+            target=self._loop.run_until_complete, args=(serve(self.app, config, shutdown_trigger=self._stopped.wait),),
+            daemon=True)
+        self._thread.start()
+        for _ in range(100):
+            try:
+                socket.create_connection(('127.0.0.1', self.port), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.05)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    async def app(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                else:
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        self.connections.add(tuple(scope['client']))
+        body = render_page(self.url, scope['path'], scope['query_string'].decode(), self.total_jobs, self.similar_jobs)
+        if body is None:
+            await send({'type': 'http.response.start', 'status': 404, 'headers': []})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+        if scope['path'].startswith('/jobs/view/'):
+            await asyncio.sleep(job_page_delay(self))
+        etag = job_etag(scope['path'])
+        if etag and dict(scope['headers']).get(b'if-none-match') == etag.encode():
+            await send({'type': 'http.response.start', 'status': 304, 'headers': [(b'etag', etag.encode())]})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+        payload = body.encode('utf-8')
+        headers = [(b'content-type', b'text/html; charset=utf-8')]
+        if etag:
+            headers.append((b'etag', etag.encode()))
+        if b'gzip' in dict(scope['headers']).get(b'accept-encoding', b''):
+            payload = gzip.compress(payload)
+            headers.append((b'content-encoding', b'gzip'))
+        await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': payload})
+
+    def shutdown(self):
+        self._loop.call_soon_threadsafe(self._stopped.set)
+        self._thread.join(timeout=5)
+
+
+def point_at(scraper: Anika.LinkedInJobScraper, server):
+    """Aim a scraper at the stand-in server and switch off rate limiting"""
+    scraper.base_search_url = server.url + SEARCH_PATH
+    scraper.base_job_url = server.url + '/jobs/view/'
+    scraper.rate_limiter = Anika.RateLimiter(search_rate=None, detail_rate=None)
+    return scraper
+
+
+def time_run(label: str, scraper: Anika.LinkedInJobScraper, jobs: int) -> float:
+    started = time.perf_counter()
+    results = scraper.search_jobs(keywords='Analyst', location='Pune, Maharashtra, India', limit=jobs)
+    elapsed = time.perf_counter() - started
+    scraper.close()
+    rate = len(results) / elapsed if elapsed else 0.0
+    per_job = scraper.bandwidth_report(len(results))['bytes_per_job'] or 0
+    print(f"{label:<28} {len(results):>5} jobs {elapsed:>8.2f}s {rate:>8.1f} jobs/s {per_job / 1024:>7.1f} KiB/job")
+    return rate
+
+
+def compare_hedging(args):
+    """Run the thread-pool and async engines through stand-in proxies with and without hedging"""
+    proxies = [start_stand_in_server(args.jobs, args.latency, args.tail_fraction, args.tail_latency)
+               for _ in range(args.proxies)]
+    try:
+        for label, make in (('threads', lambda hedge: Anika.LinkedInJobScraper(
+                                 proxies=[p.url for p in proxies], use_proxies=True,
+                                 detail_workers=args.concurrency, hedge_requests=hedge)),
+                            ('async', lambda hedge: Anika.AsyncLinkedInJobScraper(
+                                 proxies=[p.url for p in proxies], use_proxies=True,
+                                 max_concurrency=args.concurrency, hedge_requests=hedge))):
+            for hedge in (False, True):
+                scraper = point_at(make(hedge), proxies[0])
+                time_run(f"{label} ({'hedged' if hedge else 'unhedged'})", scraper, args.jobs)
+                report = scraper.latency_report()
+                detail = report.get('detail', {})
+                print(f"{'':<28} hedge rate {report['hedge_rate']:.1%}, detail p99 {detail.get('p99') or 0:.2f}s "
+                      f"(first copies alone: {detail.get('p99_unhedged') or 0:.2f}s)")
+    finally:
+        for proxy in proxies:
+            proxy.shutdown()
+
+
+def compare_transports(args):
+    """Thread-pool engine over the requests session (HTTP/1.1) and HTTPXTransport (h2c)"""
+    transports = (('HTTP/1.1 (requests)', None),
+                  ('HTTP/2 (httpx)', functools.partial(Anika.HTTPXTransport, http1=False)))
+    for label, factory in transports:
+        server = H2StandInServer(args.jobs, args.latency, args.tail_fraction, args.tail_latency)
+        try:
+            scraper = Anika.LinkedInJobScraper(detail_workers=args.concurrency, transport_factory=factory)
+            time_run(label, point_at(scraper, server), args.jobs)
+            print(f"{'':<28} {len(server.connections)} connections")
+        finally:
+            server.shutdown()
+
+
+def compare_streaming(args):
+    """Full reads against streamed job pages cut off after the criteria list, per engine"""
+    server = start_stand_in_server(args.jobs, args.latency, similar_jobs=args.similar_jobs)
+    try:
+        for label, make in (('threads', lambda stream: Anika.LinkedInJobScraper(
+                                 detail_workers=args.concurrency, stream_details=stream)),
+                            ('async', lambda stream: Anika.AsyncLinkedInJobScraper(
+                                 max_concurrency=args.concurrency, stream_details=stream))):
+            for stream in (False, True):
+                scraper = point_at(make(stream), server)
+                time_run(f"{label} ({'streamed' if stream else 'full read'})", scraper, args.jobs)
+                if stream:
+                    print(f"{'':<28} {scraper.stream_counts['cut']} pages cut short, "
+                          f"{scraper.stream_counts['full_reads']} refetched in full")
+    finally:
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenario', choices=('engines', 'hedging', 'http2', 'streaming'), default='engines',
+                        help='Compare serial/thread/async engines, hedged against unhedged requests, '
+                             'HTTP/1.1 against HTTP/2 transports, or full against streamed job page reads')
+    parser.add_argument('--jobs', type=int, default=100, help='Number of jobs to scrape per run')
+    parser.add_argument('--latency', type=float, default=0.2, help='Seconds the stand-in waits before answering a job page')
+    parser.add_argument('--concurrency', type=int, default=16, help='Detail fetches in flight for the thread pool and async engine')
+    parser.add_argument('--proxies', type=int, default=3, help='Stand-in proxies for the hedging scenario')
+    parser.add_argument('--tail-fraction', type=float, default=0.02, help='Share of job pages answered slowly (hedging and http2 scenarios)')
+    parser.add_argument('--similar-jobs', type=int, default=400,
+                        help='Similar-job links after the criteria list on each job page (streaming scenario)')
+    parser.add_argument('--tail-latency', type=float, default=2.0, help='Extra seconds a slow job page takes')
+    args = parser.parse_args()
+
+    logging.getLogger('Anika').setLevel(logging.WARNING)
+    if args.scenario == 'hedging':
+        compare_hedging(args)
+        return
+    if args.scenario == 'http2':
+        compare_transports(args)
+        return
+    if args.scenario == 'streaming':
+        compare_streaming(args)
+        return
+    server = start_stand_in_server(args.jobs, args.latency)
+    try:
+        serial = time_run('serial', point_at(Anika.LinkedInJobScraper(), server), args.jobs)
+        time_run(f'threads (workers={args.concurrency})',
+                 point_at(Anika.LinkedInJobScraper(detail_workers=args.concurrency), server), args.jobs)
+        concurrent = time_run(f'async (concurrency={args.concurrency})',
+                              point_at(Anika.AsyncLinkedInJobScraper(max_concurrency=args.concurrency), server), args.jobs)
+        if serial:
+            print(f"async speedup over serial: {concurrent / serial:.1f}x")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Re-run extraction over a raw-page archive written by Anika.py, without touching the network.
+
+Search pages give the job cards and job pages their details, both parsed in worker
+processes with the scraper's current _parse_job_list and _parse_job_details, so a markup
+fix or a new field is backfilled over everything archived as a CPU-only batch job.
+Only the newest complete copy of each URL is used. Job pages archived only as cut-off
+streamed reads (stream_details) are parsed as they are and counted in the summary, since
+fields below the cut cannot be backfilled from them.
+
+    python reextract.py --archive anika_archive --output linkedin_jobs_reextracted.json
+    python reextract.py --archive anika_archive --workers 8 --chunk-size 100
+"""
+import argparse
+import functools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import Anika
+
+_scraper = None
+
+
+def _init_worker():
+    """One scraper per worker process, used only for its parsers"""
+    global _scraper
+    _scraper = Anika.LinkedInJobScraper()
+
+
+def extract(path: str, records: List[Tuple]) -> List[Tuple[str, str, Optional[str], object]]:
+    """Parse a chunk of (kind, url, job_id, offset, length, truncated) records from the archive at path"""
+    results = []
+    for kind, url, job_id, offset, length, _ in records:
+        _, html = Anika.HtmlArchive.read_record(path, offset, length)
+        parsed = _scraper._parse_job_list(html) if kind == 'search' else _scraper._parse_job_details(html)
+        results.append((kind, url, job_id, parsed))
+    return results
+
+
+def reextract(directory: str, workers: Optional[int] = None, chunk_size: int = 50) -> List[Dict]:
+    """Jobs rebuilt from an archive: search cards in archive order, merged with their details"""
+    if not os.path.exists(os.path.join(directory, Anika.HtmlArchive.INDEX)):
+        raise FileNotFoundError(f"No archive index in {directory}")
+    archive = Anika.HtmlArchive(directory)
+    records = archive.latest()
+    path = archive.path
+    archive.close()
+    chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+
+    cards, details = {}, {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        # map() keeps chunk order, so newer search pages overwrite older cards for the same job
+        for results in executor.map(functools.partial(extract, path), chunks):
+            for kind, url, job_id, parsed in results:
+                if kind == 'search':
+                    for card in parsed:
+                        cards[Anika.job_id_from_url(card['jobUrl'])] = card
+                elif job_id:
+                    details[job_id] = (url, parsed)
+
+    jobs = []
+    for job_id, card in cards.items():
+        _, job_details = details.pop(job_id, (None, {}))
+        card.update(job_details)
+        jobs.append(card)
+    # Job pages whose search page was served from the search page cache rather than archived
+    for job_id, (url, job_details) in details.items():
+        jobs.append(dict(job_details, jobUrl=url))
+    Anika.logger.info(f"Re-extracted {len(jobs)} jobs from {len(records)} archived pages "
+                      f"({len(jobs) - len(details)} with search cards)")
+    truncated = sum(1 for record in records if record[5])
+    if truncated:
+        Anika.logger.warning(f"{truncated} job pages were only archived cut off (stream_details); "
+                             f"fields below the cut are missing from those jobs")
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--archive', default='anika_archive', help='Directory Anika.py archived pages to')
+    parser.add_argument('--output', default='linkedin_jobs_reextracted.json')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: one per CPU)')
+    parser.add_argument('--chunk-size', type=int, default=50, help='Pages handed to a worker at a time')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    jobs = reextract(args.archive, args.workers, args.chunk_size)
+    Anika.LinkedInJobScraper().save_to_json(jobs, args.output)
+    Anika.logger.info(f"Re-extraction took {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()